@@ -1,9 +1,14 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import re
-from datetime import datetime, date
+from datetime import datetime
 import io
+import json
 import os
+import pyarrow as pa
+from pyarrow import csv as pacsv
+from pyarrow import parquet as pq
 
 # Page configuration
 st.set_page_config(
@@ -71,77 +76,181 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Column types handed to the Arrow CSV reader (columns absent from the file are ignored)
+CSV_COLUMN_TYPES = {
+    'Year': pa.int32(),
+    'Withdrawals': pa.float64(),
+    'Social Security #': pa.string(),
+    'Unit Holder ID': pa.string(),
+    'Date_of_Birth': pa.timestamp('s'),
+}
+
+# Columns shown in the Withdrawals and Retirees result tables
+WITHDRAWAL_DISPLAY_COLS = ('Contributor Name', 'Unit Holder ID', 'Withdrawals', 'Year', 'Month', 'Age')
+RETIREE_DISPLAY_COLS = ('Contributor Name', 'Unit Holder ID', 'Age', 'birth_date', 'Year', 'Month')
+
+# Other text columns stored as Arrow-backed strings (one buffer per column, not a Python
+# str per cell); the ID, SSNIT and month columns are converted where they are cleaned
+STRING_COLUMNS = ('Contributor Name', 'Address', 'Employer Code', 'Scheme Code')
+
+# Lowercase month abbreviations, in calendar order
+_MONTHS = pd.Index(['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'])
+
+def read_csv_typed(path):
+    """Read a CSV file with PyArrow, typing the known columns while parsing"""
+    # Large blocks are parsed in parallel on Arrow's thread pool
+    read_options = pacsv.ReadOptions(use_threads=True, block_size=64 << 20)
+    parse_options = pacsv.ParseOptions(delimiter=',')
+    try:
+        table = pacsv.read_csv(
+            path,
+            read_options=read_options,
+            parse_options=parse_options,
+            convert_options=pacsv.ConvertOptions(column_types=CSV_COLUMN_TYPES, strings_can_be_null=True)
+        )
+    except pa.ArrowInvalid:
+        # A typed column holds values Arrow can't convert - keep the IDs as text
+        # and let clean_data coerce the rest
+        text_columns = {col: pa.string() for col, col_type in CSV_COLUMN_TYPES.items() if col_type == pa.string()}
+        table = pacsv.read_csv(
+            path,
+            read_options=read_options,
+            parse_options=parse_options,
+            convert_options=pacsv.ConvertOptions(column_types=text_columns, strings_can_be_null=True)
+        )
+    return table.to_pandas()
+
+def clean_data(df):
+    """Clean and standardise a freshly parsed SSNIT dataframe"""
+    # Clean the Social Security column
+    if 'Social Security #' in df.columns:
+        df['Social Security #'] = df['Social Security #'].astype('string[pyarrow]').str.strip()
+    
+    # Normalise the IDs to stripped strings to handle mixed data types, and keep a
+    # lowercased copy for case-insensitive substring searches
+    if 'Unit Holder ID' in df.columns:
+        df['Unit Holder ID'] = df['Unit Holder ID'].astype('string[pyarrow]').str.strip()
+        df['_uid_lower'] = df['Unit Holder ID'].str.lower()
+    
+    # Handle different date column names
+    date_columns = ['Date_of_Birth', 'combined', 'DOB', 'Birth_Date']
+    for col in date_columns:
+        if col in df.columns:
+            try:
+                if not pd.api.types.is_datetime64_any_dtype(df[col]):
+                    df[col] = pd.to_datetime(df[col], errors='coerce')
+                df[col] = df[col].dt.as_unit('s')  # Dates of birth only need seconds
+                df['birth_date'] = df[col]  # Standardize to 'birth_date'
+                break
+            except:
+                continue
+    
+    # Convert Year to numeric for proper sorting
+    if 'Year' in df.columns and not pd.api.types.is_numeric_dtype(df['Year']):
+        df['Year'] = pd.to_numeric(df['Year'], errors='coerce')
+    
+    # Handle Month column - keep original values but create a numeric version for sorting
+    if 'Month' in df.columns:
+        # Keep original month values
+        df['Month_original'] = df['Month'].astype('string[pyarrow]')
+        df['Month'] = df['Month_original']
+    
+        # Create numeric month column for sorting from the three-letter abbreviation
+        months = df['Month_original'].str.lower().str.strip().str.slice(0, 3)
+        month_codes = _MONTHS.get_indexer(months) + 1
+        df['Month_numeric'] = pd.Series(month_codes, index=df.index, dtype='Int8').mask(month_codes == 0)
+    
+    for col in STRING_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('string[pyarrow]')
+    
+    # Sort the entire dataframe chronologically (oldest first)
+    if 'Year' in df.columns and 'Month_numeric' in df.columns:
+        df = df.sort_values(['Year', 'Month_numeric'], ascending=[True, True])
+    
+    # Clean withdrawals column for filtering
+    if 'Withdrawals' in df.columns:
+        if not pd.api.types.is_numeric_dtype(df['Withdrawals']):
+            df['Withdrawals'] = pd.to_numeric(df['Withdrawals'], errors='coerce')
+        df['Withdrawals'] = df['Withdrawals'].fillna(0)
+        df['_has_withdrawal'] = df['Withdrawals'].ne(0).to_numpy()
+    
+    return df
+
+# Bump whenever clean_data changes so stale Parquet caches are rebuilt
+PARQUET_CACHE_VERSION = 9
+
+def read_parquet_cache(parquet_path, csv_path):
+    """Return the cleaned dataframe cached next to the CSV, or None if missing or stale"""
+    if not os.path.exists(parquet_path):
+        return None
+    
+    # Check the attrs pandas stored in the schema metadata before reading any data
+    try:
+        metadata = pq.read_schema(parquet_path).metadata or {}
+        attrs = json.loads(metadata.get(b'PANDAS_ATTRS', b'{}'))
+    except (OSError, pa.ArrowException, ValueError):
+        return None
+    
+    # The cache must come from this exact CSV - a replaced file can carry an older
+    # mtime (cp -p, rsync -t, unzip), so compare for equality rather than age
+    csv_stat = os.stat(csv_path)
+    if (attrs.get('cache_version') != PARQUET_CACHE_VERSION
+            or attrs.get('csv_mtime_ns') != csv_stat.st_mtime_ns
+            or attrs.get('csv_size') != csv_stat.st_size):
+        return None
+    
+    try:
+        df = pd.read_parquet(parquet_path, engine='pyarrow')
+    except (OSError, pa.ArrowException):
+        return None
+    
+    # Parquet has no seconds unit, so restore the datetime64[s] columns clean_data produces
+    for col in df.select_dtypes(include='datetime').columns:
+        df[col] = df[col].dt.as_unit('s')
+    return df
+
+def write_parquet_cache(df, parquet_path, csv_path):
+    """Save the cleaned dataframe as Parquet so later starts can skip parsing"""
+    csv_stat = os.stat(csv_path)
+    df.attrs['cache_version'] = PARQUET_CACHE_VERSION
+    df.attrs['csv_mtime_ns'] = csv_stat.st_mtime_ns
+    df.attrs['csv_size'] = csv_stat.st_size
+    try:
+        df.to_parquet(parquet_path, engine='pyarrow', compression='zstd', use_dictionary=True)
+    except (OSError, pa.ArrowException):
+        # A read-only directory only costs us the cache, not the data
+        pass
+
+@st.cache_resource
+def _find_csv():
+    """Pick the data file - Combined.csv if present, otherwise the first CSV in the directory"""
+    if os.path.exists('Combined.csv'):
+        return 'Combined.csv'
+    
+    # scandir entries carry their file type, so no extra stat per file
+    with os.scandir('.') as entries:
+        for entry in entries:
+            if entry.name.endswith('.csv') and not entry.name.startswith('.') and entry.is_file():
+                return entry.name
+    return None
+
 @st.cache_data
 def load_data():
     """Load the SSNIT data - supports any CSV file in the directory"""
     try:
-        # Get all CSV files in the current directory
-        csv_files = [f for f in os.listdir('.') if f.endswith('.csv')]
-        if not csv_files:
+        file_to_use = _find_csv()
+        if file_to_use is None:
             st.error("No CSV files found in the current directory")
             return pd.DataFrame(), ""
         
-        # If there's a Combined.csv, use it, otherwise use the first CSV file
-        if 'Combined.csv' in csv_files:
-            file_to_use = 'Combined.csv'
-        else:
-            file_to_use = csv_files[0]
-        
-        df = pd.read_csv(file_to_use)
+        parquet_path = os.path.splitext(file_to_use)[0] + '.parquet'
+        df = read_parquet_cache(parquet_path, file_to_use)
+        if df is None:
+            df = clean_data(read_csv_typed(file_to_use))
+            write_parquet_cache(df, parquet_path, file_to_use)
         st.success(f"Data loaded successfully from: {file_to_use}")
         
-        # Clean the Social Security column
-        if 'Social Security #' in df.columns:
-            df['Social Security #'] = df['Social Security #'].astype(str).str.strip()
-        
-        # Handle different date column names
-        date_columns = ['Date_of_Birth', 'combined', 'DOB', 'Birth_Date']
-        for col in date_columns:
-            if col in df.columns:
-                try:
-                    df[col] = pd.to_datetime(df[col], errors='coerce')
-                    df['birth_date'] = df[col]  # Standardize to 'birth_date'
-                    break
-                except:
-                    continue
-        
-        # Convert Year to numeric for proper sorting
-        if 'Year' in df.columns:
-            df['Year'] = pd.to_numeric(df['Year'], errors='coerce')
-        
-        # Handle Month column - keep original values but create a numeric version for sorting
-        if 'Month' in df.columns:
-            # Keep original month values
-            df['Month_original'] = df['Month'].astype(str)
-            
-            # Create numeric version for sorting
-            month_map = {
-                'jan': 1, 'january': 1,
-                'feb': 2, 'february': 2,
-                'mar': 3, 'march': 3,
-                'apr': 4, 'april': 4,
-                'may': 5, 
-                'jun': 6, 'june': 6,
-                'jul': 7, 'july': 7,
-                'aug': 8, 'august': 8,
-                'sep': 9, 'september': 9,
-                'oct': 10, 'october': 10,
-                'nov': 11, 'november': 11,
-                'dec': 12, 'december': 12
-            }
-            
-            # Create numeric month column for sorting
-            df['Month_numeric'] = df['Month'].astype(str).str.lower().str.strip().map(month_map)
-            df['Month_numeric'] = pd.to_numeric(df['Month_numeric'], errors='coerce')
-        
-        # Sort the entire dataframe chronologically (oldest first)
-        if 'Year' in df.columns and 'Month_numeric' in df.columns:
-            df = df.sort_values(['Year', 'Month_numeric'], ascending=[True, True])
-        
-        # Clean withdrawals column for filtering
-        if 'Withdrawals' in df.columns:
-            df['Withdrawals'] = pd.to_numeric(df['Withdrawals'], errors='coerce').fillna(0)
-        
         return df, file_to_use
     
     except Exception as e:
@@ -161,89 +270,125 @@ def validate_unit_holder_id(unit_holder_id):
     
     return True, unit_holder_clean
 
-def calculate_age(birth_date):
-    """Calculate age from birth date"""
-    if pd.isna(birth_date):
-        return "N/A"
+def vectorized_age(birth_dates, today=None):
+    """Calculate ages for a Series of birth dates in one vectorized pass"""
+    if today is None:
+        today = pd.Timestamp.today()
+    months = birth_dates.dt.month
+    days = birth_dates.dt.day
+    before_birthday = (today.month < months) | ((today.month == months) & (today.day < days))
+    age = today.year - birth_dates.dt.year - before_birthday.astype('int16')
+    return age.astype('Int16')
+
+# Ages depend on today's date, so they live outside the load_data cache and are
+# keyed on the day as well as the data file
+@st.cache_resource(max_entries=1)
+def add_age_columns(_df, filename, mtime, today):
+    """Add the _age and _is_retiree helper columns for the given day"""
+    if 'birth_date' not in _df.columns:
+        return _df
+    
+    ages = vectorized_age(_df['birth_date'], today)
+    return _df.assign(_age=ages, _is_retiree=(ages.notna() & ages.ge(60)).to_numpy(dtype=bool))
+
+@st.cache_resource(max_entries=1)
+def build_uid_index(_df, filename, mtime, today):
+    """Index the records by Unit Holder ID so searches avoid a full scan"""
+    if 'Unit Holder ID' not in _df.columns:
+        return pd.DataFrame()
     
-    try:
-        if isinstance(birth_date, str):
-            birth_date = pd.to_datetime(birth_date)
-        
-        today = date.today()
-        birth_date = birth_date.date()
-        age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
-        return age
-    except:
-        return "N/A"
-
-def search_by_unit_holder_id(df, unit_holder_id):
+    # IDs are already stripped strings (see clean_data); the stable sort keeps
+    # each holder's records in chronological order
+    return _df.set_index('Unit Holder ID', drop=False).sort_index(kind='stable')
+
+def search_by_unit_holder_id(uid_index, unit_holder_id):
     """Search for records by Unit Holder ID and return the most recent one"""
-    if 'Unit Holder ID' not in df.columns:
+    if 'Unit Holder ID' not in uid_index.columns:
         return pd.DataFrame(), pd.DataFrame()
     
-    # Convert both to string for comparison to handle mixed data types
-    df_copy = df.copy()
-    df_copy['Unit Holder ID'] = df_copy['Unit Holder ID'].astype(str).str.strip()
     unit_holder_id = str(unit_holder_id).strip()
     
-    # Get all records for this Unit Holder ID
-    all_results = df_copy[df_copy['Unit Holder ID'] == unit_holder_id].copy()
-    
-    if len(all_results) == 0:
+    if unit_holder_id not in uid_index.index:
         return pd.DataFrame(), pd.DataFrame()
     
-    # Sort chronologically (oldest first)
-    if 'Year' in all_results.columns and 'Month_numeric' in all_results.columns:
-        all_results = all_results.sort_values(['Year', 'Month_numeric'], ascending=[True, True])
+    # Get all records for this Unit Holder ID - the stable index sort keeps them
+    # in the chronological order clean_data sorted the frame into
+    all_results = uid_index.loc[[unit_holder_id]]
     
-    # Get the most recent record (last row after sorting)
+    # Get the most recent record (last row)
     latest_record = all_results.iloc[[-1]]
     
     return latest_record, all_results
 
 def get_withdrawal_records(df):
     """Get all records with withdrawals (not equal to 0)"""
-    if 'Withdrawals' not in df.columns:
+    if '_has_withdrawal' not in df.columns:
         return pd.DataFrame()
     
-    withdrawal_records = df[df['Withdrawals'] != 0].copy()
+    # The selection keeps the chronological order clean_data sorted the frame into
+    withdrawal_records = df.loc[df['_has_withdrawal']]
     
-    # Add age calculation for additional info
-    if 'birth_date' in withdrawal_records.columns:
-        withdrawal_records['Age'] = withdrawal_records['birth_date'].apply(calculate_age)
-    
-    # Sort chronologically (oldest first)
-    if 'Year' in withdrawal_records.columns and 'Month_numeric' in withdrawal_records.columns:
-        withdrawal_records = withdrawal_records.sort_values(['Year', 'Month_numeric'], ascending=[True, True])
+    # Add age for additional info
+    if '_age' in withdrawal_records.columns:
+        withdrawal_records = withdrawal_records.assign(Age=withdrawal_records['_age'])
     
     return withdrawal_records
 
 def get_retiree_records(df):
     """Get all records where person is 60 years or older"""
-    if 'birth_date' not in df.columns:
+    if '_is_retiree' not in df.columns:
         return pd.DataFrame()
     
-    # Calculate ages and filter for 60+
-    df_with_age = df.copy()
-    df_with_age['Age'] = df_with_age['birth_date'].apply(calculate_age)
+    # The selection keeps the chronological order clean_data sorted the frame into
+    retiree_records = df.loc[df['_is_retiree']]
+    retiree_records = retiree_records.assign(Age=retiree_records['_age'])
     
-    # Filter for valid numeric ages first, then check >= 60
-    numeric_ages = df_with_age[df_with_age['Age'] != "N/A"].copy()
-    retiree_records = numeric_ages[numeric_ages['Age'] >= 60].copy()
+    return retiree_records
+
+# Cached per data file and day: Streamlit skips hashing the leading-underscore
+# dataframe, so filename, mtime and today form the key
+@st.cache_data
+def compute_sidebar_stats(_df, filename, mtime, today):
+    """Compute the Database Info and Quick Stats shown in the sidebar"""
+    stats = {'n': len(_df)}
     
-    # Sort chronologically (oldest first)
-    if 'Year' in retiree_records.columns and 'Month_numeric' in retiree_records.columns:
-        retiree_records = retiree_records.sort_values(['Year', 'Month_numeric'], ascending=[True, True])
+    if 'Year' in _df.columns:
+        stats['years'] = sorted(_df['Year'].dropna().unique().tolist())
     
-    return retiree_records
+    if '_has_withdrawal' in _df.columns:
+        stats['withdrawal_count'] = int(_df['_has_withdrawal'].sum())
+    
+    if '_is_retiree' in _df.columns:
+        stats['retiree_count'] = int(_df['_is_retiree'].sum())
+    
+    return stats
+
+def public_columns(df):
+    """Columns to export, leaving out the internal '_'-prefixed helper columns"""
+    return [col for col in df.columns if not col.startswith('_')]
+
+def _df_to_csv_bytes(df):
+    """Serialise a dataframe to CSV bytes for download using Arrow's CSV writer"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    
+    # Timestamps here are birth dates - write them as plain dates like pandas did
+    for i, field in enumerate(table.schema):
+        if pa.types.is_timestamp(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.date32(), safe=False))
+    
+    buf = io.BytesIO()
+    pacsv.write_csv(table, buf)
+    return buf.getvalue()
 
 def display_record(record, all_records):
     """Display a single record with information about multiple records"""
+    # Unpack the single-row frame once instead of indexing each column
+    row = record.iloc[0]
+    
     # Show info about multiple records if they exist
     if len(all_records) > 1:
         st.markdown('<div class="latest-record">', unsafe_allow_html=True)
-        st.info(f"📊 **Multiple records found ({len(all_records)} total)** - Showing the most recent record from {record['Year'].iloc[0] if 'Year' in record.columns else 'N/A'}")
+        st.info(f"📊 **Multiple records found ({len(all_records)} total)** - Showing the most recent record from {row['Year'] if 'Year' in row.index else 'N/A'}")
         
         # Show years available
         if 'Year' in all_records.columns:
@@ -258,47 +403,60 @@ def display_record(record, all_records):
     col1, col2 = st.columns(2)
     
     with col1:
-        st.write(f"**Name:** {record['Contributor Name'].iloc[0] if 'Contributor Name' in record.columns else 'N/A'}")
-        st.write(f"**Unit Holder ID:** {record['Unit Holder ID'].iloc[0] if 'Unit Holder ID' in record.columns else 'N/A'}")
-        st.write(f"**SSNIT Number:** {record['Social Security #'].iloc[0] if 'Social Security #' in record.columns else 'N/A'}")
+        st.write(f"**Name:** {row['Contributor Name'] if 'Contributor Name' in row.index else 'N/A'}")
+        st.write(f"**Unit Holder ID:** {row['Unit Holder ID'] if 'Unit Holder ID' in row.index else 'N/A'}")
+        st.write(f"**SSNIT Number:** {row['Social Security #'] if 'Social Security #' in row.index and not pd.isna(row['Social Security #']) else 'N/A'}")
         
         # Handle birth date
-        birth_date = record['birth_date'].iloc[0] if 'birth_date' in record.columns else None
-        age = calculate_age(birth_date)
+        birth_date = row['birth_date'] if 'birth_date' in row.index else None
+        age = row['_age'] if '_age' in row.index else None
         st.write(f"**Date of Birth:** {birth_date if not pd.isna(birth_date) else 'N/A'}")
-        st.write(f"**Age:** {age}")
+        st.write(f"**Age:** {age if not pd.isna(age) else 'N/A'}")
     
     with col2:
-        st.write(f"**Address:** {record['Address'].iloc[0] if 'Address' in record.columns and not pd.isna(record['Address'].iloc[0]) else 'N/A'}")
-        st.write(f"**Year:** {record['Year'].iloc[0] if 'Year' in record.columns else 'N/A'}")
-        st.write(f"**Month:** {record['Month_original'].iloc[0] if 'Month_original' in record.columns and not pd.isna(record['Month_original'].iloc[0]) else 'N/A'}")
+        st.write(f"**Address:** {row['Address'] if 'Address' in row.index and not pd.isna(row['Address']) else 'N/A'}")
+        st.write(f"**Year:** {row['Year'] if 'Year' in row.index else 'N/A'}")
+        st.write(f"**Month:** {row['Month_original'] if 'Month_original' in row.index and not pd.isna(row['Month_original']) else 'N/A'}")
     
     # Employment Information
     st.subheader("Employment Information")
     col3, col4 = st.columns(2)
     
     with col3:
-        st.write(f"**Employer Code:** {record['Employer Code'].iloc[0] if 'Employer Code' in record.columns and not pd.isna(record['Employer Code'].iloc[0]) else 'N/A'}")
-        st.write(f"**Scheme Code:** {record['Scheme Code'].iloc[0] if 'Scheme Code' in record.columns and not pd.isna(record['Scheme Code'].iloc[0]) else 'N/A'}")
+        st.write(f"**Employer Code:** {row['Employer Code'] if 'Employer Code' in row.index and not pd.isna(row['Employer Code']) else 'N/A'}")
+        st.write(f"**Scheme Code:** {row['Scheme Code'] if 'Scheme Code' in row.index and not pd.isna(row['Scheme Code']) else 'N/A'}")
     
     # Financial Information
     st.subheader("Financial Information")
     col5, col6, col7 = st.columns(3)
     
     with col5:
-        st.write(f"**Begin Balance:** {record['Begin Bal'].iloc[0] if 'Begin Bal' in record.columns and not pd.isna(record['Begin Bal'].iloc[0]) else 'N/A'}")
-        st.write(f"**End Balance:** {record['End Bal'].iloc[0] if 'End Bal' in record.columns and not pd.isna(record['End Bal'].iloc[0]) else 'N/A'}")
+        st.write(f"**Begin Balance:** {row['Begin Bal'] if 'Begin Bal' in row.index and not pd.isna(row['Begin Bal']) else 'N/A'}")
+        st.write(f"**End Balance:** {row['End Bal'] if 'End Bal' in row.index and not pd.isna(row['End Bal']) else 'N/A'}")
     
     with col6:
-        st.write(f"**Withdrawals:** {record['Withdrawals'].iloc[0] if 'Withdrawals' in record.columns and not pd.isna(record['Withdrawals'].iloc[0]) else 'N/A'}")
-        st.write(f"**Contribution:** {record['Contribution'].iloc[0] if 'Contribution' in record.columns and not pd.isna(record['Contribution'].iloc[0]) else 'N/A'}")
+        st.write(f"**Withdrawals:** {row['Withdrawals'] if 'Withdrawals' in row.index and not pd.isna(row['Withdrawals']) else 'N/A'}")
+        st.write(f"**Contribution:** {row['Contribution'] if 'Contribution' in row.index and not pd.isna(row['Contribution']) else 'N/A'}")
     
     with col7:
-        st.write(f"**App Contribute:** {record['App Contribute'].iloc[0] if 'App Contribute' in record.columns and not pd.isna(record['App Contribute'].iloc[0]) else 'N/A'}")
-        st.write(f"**Misc Contri.:** {record['Misc Contri.'].iloc[0] if 'Misc Contri.' in record.columns and not pd.isna(record['Misc Contri.'].iloc[0]) else 'N/A'}")
+        st.write(f"**App Contribute:** {row['App Contribute'] if 'App Contribute' in row.index and not pd.isna(row['App Contribute']) else 'N/A'}")
+        st.write(f"**Misc Contri.:** {row['Misc Contri.'] if 'Misc Contri.' in row.index and not pd.isna(row['Misc Contri.']) else 'N/A'}")
     
     st.markdown('</div>', unsafe_allow_html=True)
 
+def _withdraw_stats(withdrawals):
+    """Count, total, positive sum and negative sum of a withdrawals array"""
+    total = withdrawals.sum()
+    positive = withdrawals.sum(where=withdrawals > 0)
+    return len(withdrawals), total, positive, total - positive
+
+def _age_stats(ages):
+    """Count, mean, max and number aged 60-65 of a retiree ages array"""
+    # Ages are small non-negative integers, so one bincount pass gives every statistic
+    counts = np.bincount(ages)
+    mean_age = (counts * np.arange(len(counts))).sum() / len(ages)
+    return len(ages), mean_age, len(counts) - 1, counts[60:66].sum()
+
 def display_withdrawal_summary(withdrawal_records):
     """Display summary of withdrawal records"""
     if len(withdrawal_records) == 0:
@@ -308,17 +466,18 @@ def display_withdrawal_summary(withdrawal_records):
     st.markdown('<div class="withdrawal-card">', unsafe_allow_html=True)
     st.subheader("💰 Withdrawal Records Summary")
     
+    total_records, total_withdrawals, positive_withdrawals, negative_withdrawals = _withdraw_stats(
+        withdrawal_records['Withdrawals'].to_numpy()
+    )
+    
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Total Records", len(withdrawal_records))
+        st.metric("Total Records", total_records)
     with col2:
-        total_withdrawals = withdrawal_records['Withdrawals'].sum()
         st.metric("Total Withdrawals", f"₵{total_withdrawals:,.2f}")
     with col3:
-        positive_withdrawals = withdrawal_records[withdrawal_records['Withdrawals'] > 0]['Withdrawals'].sum()
         st.metric("Positive Withdrawals", f"₵{positive_withdrawals:,.2f}")
     with col4:
-        negative_withdrawals = withdrawal_records[withdrawal_records['Withdrawals'] < 0]['Withdrawals'].sum()
         st.metric("Negative Adjustments", f"₵{negative_withdrawals:,.2f}")
     
     st.markdown('</div>', unsafe_allow_html=True)
@@ -332,100 +491,103 @@ def display_retiree_summary(retiree_records):
     st.markdown('<div class="retiree-card">', unsafe_allow_html=True)
     st.subheader("👥 Retiree Records Summary")
     
+    # Retiree ages are never missing (missing ages fail the 60+ check)
+    total_retirees, avg_age, oldest_age, age_60_65 = _age_stats(retiree_records['Age'].to_numpy(dtype=np.int64))
+    
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Total Retirees", len(retiree_records))
+        st.metric("Total Retirees", total_retirees)
     with col2:
-        avg_age = retiree_records['Age'].mean()
         st.metric("Average Age", f"{avg_age:.1f} years")
     with col3:
-        oldest_age = retiree_records['Age'].max()
         st.metric("Oldest Person", f"{oldest_age} years")
     with col4:
-        age_60_65 = len(retiree_records[(retiree_records['Age'] >= 60) & (retiree_records['Age'] <= 65)])
         st.metric("Ages 60-65", age_60_65)
     
     st.markdown('</div>', unsafe_allow_html=True)
 
-def records_lookup_tab(df, filename):
+@st.fragment
+def records_lookup_tab(df, filename, mtime, today):
     """Handle the Records Lookup functionality"""
     st.subheader("🔍 Search by Unit Holder ID")
     
     # Search Container
     st.markdown('<div class="search-container">', unsafe_allow_html=True)
     
-    col1, col2 = st.columns([3, 1])
-    
-    with col1:
-        unit_holder_input = st.text_input(
-            "Enter Unit Holder ID:",
-            placeholder="e.g., 12345678",
-            help="Enter the Unit Holder ID to search for records",
-            key="records_search"
-        )
-    
-    with col2:
-        st.write("")
-        st.write("")
-        search_button = st.button("Search", type="primary", key="records_search_btn")
+    # A form batches the typing, so a search only runs on Enter or the Search button
+    with st.form("uid_search", border=False):
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            unit_holder_input = st.text_input(
+                "Enter Unit Holder ID:",
+                placeholder="e.g., 12345678",
+                help="Enter the Unit Holder ID to search for records",
+                key="records_search"
+            )
+        
+        with col2:
+            st.write("")
+            st.write("")
+            search_button = st.form_submit_button("Search", type="primary")
     
     st.markdown('</div>', unsafe_allow_html=True)
     
+    # Remember the submitted query so the result stays up across reruns (e.g. downloads)
+    if search_button:
+        st.session_state['last_uid_search'] = unit_holder_input
+    unit_holder_input = st.session_state.get('last_uid_search', "")
+    
     # Perform search
-    if search_button or unit_holder_input:
-        if unit_holder_input:
-            is_valid, result = validate_unit_holder_id(unit_holder_input)
+    if unit_holder_input:
+        is_valid, result = validate_unit_holder_id(unit_holder_input)
+        
+        if not is_valid:
+            st.markdown(f'<div class="error-box">ERROR: {result}</div>', unsafe_allow_html=True)
+        else:
+            unit_holder_clean = result
             
-            if not is_valid:
-                st.markdown(f'<div class="error-box">ERROR: {result}</div>', unsafe_allow_html=True)
+            with st.spinner("Searching..."):
+                uid_index = build_uid_index(df, filename, mtime, today)
+                latest_record, all_records = search_by_unit_holder_id(uid_index, unit_holder_clean)
+            
+            if len(latest_record) == 0:
+                st.markdown(f'<div class="error-box">No record found for Unit Holder ID: {unit_holder_clean}</div>', unsafe_allow_html=True)
+                st.info("Please check the Unit Holder ID and try again.")
             else:
-                unit_holder_clean = result
+                st.markdown(f'<div class="success-box">Record found for Unit Holder ID: {unit_holder_clean}</div>', unsafe_allow_html=True)
+                display_record(latest_record, all_records)
+                
+                # Export options
+                st.subheader("Export Options")
+                col1, col2 = st.columns(2)
                 
-                with st.spinner("Searching..."):
-                    latest_record, all_records = search_by_unit_holder_id(df, unit_holder_clean)
+                with col1:
+                    # Export latest record
+                    # Ensure we maintain original column order
+                    export_latest = latest_record[public_columns(df)]
+                    csv_data_latest = _df_to_csv_bytes(export_latest)
+                    st.download_button(
+                        label="📄 Download Latest Record",
+                        data=csv_data_latest,
+                        file_name=f"UnitHolder_{unit_holder_clean}_latest_record.csv",
+                        mime="text/csv"
+                    )
                 
-                if len(latest_record) == 0:
-                    st.markdown(f'<div class="error-box">No record found for Unit Holder ID: {unit_holder_clean}</div>', unsafe_allow_html=True)
-                    st.info("Please check the Unit Holder ID and try again.")
-                else:
-                    st.markdown(f'<div class="success-box">Record found for Unit Holder ID: {unit_holder_clean}</div>', unsafe_allow_html=True)
-                    display_record(latest_record, all_records)
-                    
-                    # Export options
-                    st.subheader("Export Options")
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        # Export latest record
-                        export_latest = latest_record.copy()
-                        # Ensure we maintain original column order and use original month values
-                        export_latest = export_latest[df.columns]
-                        if 'Month_original' in export_latest.columns:
-                            export_latest['Month'] = export_latest['Month_original']
-                        csv_data_latest = export_latest.to_csv(index=False)
+                with col2:
+                    # Export all records for this person
+                    if len(all_records) > 1:
+                        # Ensure we maintain original column order
+                        export_all = all_records[public_columns(df)]
+                        csv_data_all = _df_to_csv_bytes(export_all)
                         st.download_button(
-                            label="📄 Download Latest Record",
-                            data=csv_data_latest,
-                            file_name=f"UnitHolder_{unit_holder_clean}_latest_record.csv",
+                            label=f"📋 Download All Records ({len(all_records)})",
+                            data=csv_data_all,
+                            file_name=f"UnitHolder_{unit_holder_clean}_all_records.csv",
                             mime="text/csv"
                         )
-                    
-                    with col2:
-                        # Export all records for this person
-                        if len(all_records) > 1:
-                            export_all = all_records.copy()
-                            # Ensure we maintain original column order and use original month values
-                            export_all = export_all[df.columns]
-                            if 'Month_original' in export_all.columns:
-                                export_all['Month'] = export_all['Month_original']
-                            csv_data_all = export_all.to_csv(index=False)
-                            st.download_button(
-                                label=f"📋 Download All Records ({len(all_records)})",
-                                data=csv_data_all,
-                                file_name=f"UnitHolder_{unit_holder_clean}_all_records.csv",
-                                mime="text/csv"
-                            )
 
+@st.fragment
 def withdrawals_tab(df, filename):
     """Handle the Withdrawals functionality"""
     st.subheader("💰 Withdrawal Records")
@@ -455,11 +617,11 @@ def withdrawals_tab(df, filename):
                                      key="withdrawal_type")
     
     # Apply filters
-    filtered_records = withdrawal_records.copy()
+    filtered_records = withdrawal_records
     
     if unit_holder_search:
         filtered_records = filtered_records[
-            filtered_records['Unit Holder ID'].astype(str).str.contains(unit_holder_search, case=False, na=False)
+            filtered_records['_uid_lower'].str.contains(unit_holder_search.lower(), regex=False, na=False)
         ]
     
     if min_amount is not None:
@@ -474,31 +636,27 @@ def withdrawals_tab(df, filename):
     st.subheader(f"Results ({len(filtered_records)} records)")
     
     if len(filtered_records) > 0:
-        # Select columns to display
-        display_columns = ['Contributor Name', 'Unit Holder ID', 'Withdrawals', 'Year', 'Month_original']
-        if 'Age' in filtered_records.columns:
-            display_columns.append('Age')
-        
-        # Filter to existing columns and rename Month_original to Month for display
-        display_df = filtered_records.copy()
-        if 'Month_original' in display_df.columns:
-            display_df['Month'] = display_df['Month_original']
-        display_columns = [col.replace('Month_original', 'Month') for col in display_columns]
+        # Project to the displayed columns first so only those are sent to the browser
+        # (skipping any the data file doesn't have, e.g. Age without birth dates)
+        display_columns = [col for col in WITHDRAWAL_DISPLAY_COLS if col in filtered_records.columns]
+        display_df = filtered_records.loc[:, display_columns]
         
         st.dataframe(
-            display_df[display_columns],
+            display_df,
             use_container_width=True,
-            hide_index=True
+            hide_index=True,
+            column_config={
+                'Withdrawals': st.column_config.NumberColumn(format="₵%.2f"),
+                'Year': st.column_config.NumberColumn(format="%d"),
+                'Age': st.column_config.NumberColumn(format="%d")
+            }
         )
         
         # Export option - maintain original column order and sorting
         st.subheader("Export Results")
-        export_data = filtered_records.copy()
-        export_data = export_data[df.columns]  # Maintain original column order
-        if 'Month_original' in export_data.columns:
-            export_data['Month'] = export_data['Month_original']
+        export_data = filtered_records[public_columns(df)]  # Maintain original column order
         
-        csv_data = export_data.to_csv(index=False)
+        csv_data = _df_to_csv_bytes(export_data)
         st.download_button(
             label=f"📊 Download Withdrawal Records ({len(filtered_records)} records)",
             data=csv_data,
@@ -508,6 +666,7 @@ def withdrawals_tab(df, filename):
     else:
         st.info("No records match your search criteria.")
 
+@st.fragment
 def retirees_tab(df, filename):
     """Handle the Retirees functionality"""
     st.subheader("👥 Retiree Records (Age 60+)")
@@ -535,11 +694,11 @@ def retirees_tab(df, filename):
         max_age = st.number_input("Maximum Age:", value=100, min_value=60, max_value=120, key="retiree_max_age")
     
     # Apply filters
-    filtered_records = retiree_records.copy()
+    filtered_records = retiree_records
     
     if unit_holder_search:
         filtered_records = filtered_records[
-            filtered_records['Unit Holder ID'].astype(str).str.contains(unit_holder_search, case=False, na=False)
+            filtered_records['_uid_lower'].str.contains(unit_holder_search.lower(), regex=False, na=False)
         ]
     
     filtered_records = filtered_records[
@@ -551,29 +710,27 @@ def retirees_tab(df, filename):
     st.subheader(f"Results ({len(filtered_records)} records)")
     
     if len(filtered_records) > 0:
-        # Select columns to display
-        display_columns = ['Contributor Name', 'Unit Holder ID', 'Age', 'birth_date', 'Year', 'Month_original']
-        
-        # Filter to existing columns and rename Month_original to Month for display
-        display_df = filtered_records.copy()
-        if 'Month_original' in display_df.columns:
-            display_df['Month'] = display_df['Month_original']
-        display_columns = [col.replace('Month_original', 'Month') for col in display_columns]
+        # Project to the displayed columns first so only those are sent to the browser
+        # (skipping any the data file doesn't have)
+        display_columns = [col for col in RETIREE_DISPLAY_COLS if col in filtered_records.columns]
+        display_df = filtered_records.loc[:, display_columns]
         
         st.dataframe(
-            display_df[display_columns],
+            display_df,
             use_container_width=True,
-            hide_index=True
+            hide_index=True,
+            column_config={
+                'Age': st.column_config.NumberColumn(format="%d"),
+                'birth_date': st.column_config.DateColumn(format="YYYY-MM-DD"),
+                'Year': st.column_config.NumberColumn(format="%d")
+            }
         )
         
         # Export option - maintain original column order and sorting
         st.subheader("Export Results")
-        export_data = filtered_records.copy()
-        export_data = export_data[df.columns]  # Maintain original column order
-        if 'Month_original' in export_data.columns:
-            export_data['Month'] = export_data['Month_original']
+        export_data = filtered_records[public_columns(df)]  # Maintain original column order
         
-        csv_data = export_data.to_csv(index=False)
+        csv_data = _df_to_csv_bytes(export_data)
         st.download_button(
             label=f"👥 Download Retiree Records ({len(filtered_records)} records)",
             data=csv_data,
@@ -594,32 +751,32 @@ def main():
         st.warning("No data available. Please ensure you have a CSV file in this directory.")
         st.stop()
     
+    # Modification time of the data file and today's date, used to key the cached helpers
+    mtime = os.path.getmtime(filename)
+    today = pd.Timestamp.today().normalize()
+    df = add_age_columns(df, filename, mtime, today)
+    
     # Sidebar with information
     with st.sidebar:
+        stats = compute_sidebar_stats(df, filename, mtime, today)
+        
         st.header("Database Info")
         st.info(f"**File:** {filename}")
-        st.info(f"**Total Records:** {len(df):,}")
+        st.info(f"**Total Records:** {stats['n']:,}")
         
-        if 'Year' in df.columns:
-            years = sorted(df['Year'].dropna().unique())
-            st.info(f"**Years Available:** {', '.join(map(str, years))}")
+        if 'years' in stats:
+            st.info(f"**Years Available:** {', '.join(map(str, stats['years']))}")
         
         # Quick stats
         st.header("Quick Stats")
         
         # Withdrawal stats
-        if 'Withdrawals' in df.columns:
-            withdrawal_count = len(df[df['Withdrawals'] != 0])
-            st.metric("Withdrawal Records", withdrawal_count)
+        if 'withdrawal_count' in stats:
+            st.metric("Withdrawal Records", stats['withdrawal_count'])
         
         # Retiree stats
-        if 'birth_date' in df.columns:
-            df_temp = df.copy()
-            df_temp['Age'] = df_temp['birth_date'].apply(calculate_age)
-            # Filter for numeric ages only, then check >= 60
-            numeric_ages = df_temp[df_temp['Age'] != "N/A"]
-            retiree_count = len(numeric_ages[numeric_ages['Age'] >= 60])
-            st.metric("Retirees (60+)", retiree_count)
+        if 'retiree_count' in stats:
+            st.metric("Retirees (60+)", stats['retiree_count'])
         
         st.header("How to Use")
         st.markdown("""
@@ -633,13 +790,14 @@ def main():
         # Refresh button
         if st.button("Refresh Data"):
             st.cache_data.clear()
+            st.cache_resource.clear()
             st.rerun()
     
-    # Create tabs
+    # Create tabs - each tab body is a fragment, so its widgets only rerun that tab
     tab1, tab2, tab3 = st.tabs(["🔍 Records Lookup", "💰 Withdrawals", "👥 Retirees"])
     
     with tab1:
-        records_lookup_tab(df, filename)
+        records_lookup_tab(df, filename, mtime, today)
     
     with tab2:
         withdrawals_tab(df, filename)